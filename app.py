@@ -2,209 +2,250 @@
 Streamlit Cloud frontend - Submit content and view X/Reddit leaderboards
 """
 
+import logging
+import os
 import streamlit as st
 import pandas as pd
+import altair as alt
 from datetime import datetime, timedelta
 import time
-from update_service import UpdateService
+import calendar
+from update_service import UpdateService, month_bounds
+
+# Status lines from the app and UpdateService go to the server log (Streamlit Cloud "Manage app");
+# third-party loggers stay at the default WARNING so per-request HTTP chatter is left out
+logging.basicConfig(format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+for logger_name in ("app", "update_service"):
+    logging.getLogger(logger_name).setLevel(logging.INFO)
+logger = logging.getLogger("app")
+
+# calendar.month_name formats on every lookup - snapshot it once
+MONTH_NAMES = tuple(calendar.month_name)
+
+AMBASSADORS = (
+    "Tony", "Emlanis", "Sir Thanos", "Martinezz", 
+    "Beltein", "Odi", "Frifalin", "BlackOwl"
+)
+
+NAV_PAGES = (
+    "✨ Submit Content", 
+    "🐦 X Leaderboard",
+    "🟠 Reddit Leaderboard",
+    "🏆 Total Leaderboard"
+)
 
 @st.cache_resource
 def get_update_service():
     return UpdateService()
 
-# Clear cache on app restart to ensure latest code is loaded
-if 'service_initialized' not in st.session_state:
-    st.cache_resource.clear()
-    st.session_state.service_initialized = True
-
 service = get_update_service()
 
+LOGO_PATH = "img/nolus.png"
+
+@st.cache_resource
+def load_logo():
+    """Read the logo once per process instead of on every rerun - None if it is missing"""
+    if not os.path.exists(LOGO_PATH):
+        return None
+    with open(LOGO_PATH, "rb") as f:
+        return f.read()
+
+logo = load_logo()
+
 st.set_page_config(
     page_title="Ambassador Dashboard",
-    page_icon="img/nolus.png",
+    page_icon=LOGO_PATH if logo is not None else "🚀",
     layout="wide"
 )
 
 # Sidebar with logo
-try:
+if logo is not None:
     col1, col2, col3 = st.sidebar.columns([1, 2, 1])
     with col2:
-        st.image("img/nolus.png", width=80)
-except:
+        st.image(logo, width=80)
+else:
     st.sidebar.write("🚀")
 
-page = st.sidebar.selectbox("Navigation", [
-    "✨ Submit Content", 
-    "🐦 X Leaderboard",
-    "🟠 Reddit Leaderboard",
-    "🏆 Total Leaderboard"
-])
+@st.cache_data(ttl=300, show_spinner=False)
+def month_options(now_key):
+    """Build month dropdown labels/values - current month first, then history.
+    now_key scopes the cache to the hour so a new month shows up on its own."""
+    available_months = service.get_available_months()
+    if not available_months:
+        return [], []
+    
+    current_month = datetime.now()
+    labels = [f"{MONTH_NAMES[current_month.month]} {current_month.year} (Current)"]
+    values = [(current_month.year, current_month.month)]
+    
+    # Add historical months
+    for year, month in available_months:
+        if not (year == current_month.year and month == current_month.month):
+            labels.append(f"{MONTH_NAMES[month]} {year}")
+            values.append((year, month))
+    
+    return labels, values
 
-if page == "✨ Submit Content":
-    st.title("✍️ Submit New Content")
+# Leaderboard reads - cached so widget reruns don't go back to the database
+@st.cache_data(ttl="5m", max_entries=8, show_spinner=False)
+def cached_leaderboard(year, month):
+    return service.get_leaderboard(year, month)
+
+@st.cache_data(ttl="5m", max_entries=8, show_spinner=False)
+def cached_reddit_leaderboard(year, month):
+    return service.get_reddit_leaderboard(year, month)
+
+@st.cache_data(ttl="5m", max_entries=8, show_spinner=False)
+def cached_total_leaderboard(year, month):
+    return service.get_total_leaderboard(year, month)
+
+@st.cache_data(ttl="5m", max_entries=8, show_spinner=False)
+def cached_daily_impressions(year, month):
+    return service.get_daily_impressions_for_month(year, month)
+
+# Closed months never change, so keep them on disk across app restarts
+# (persisted caches ignore ttl, which is why the current month stays in memory).
+# A failed read raises in the service, and st.cache_data never stores exceptions,
+# so only real results - including a month with no tracking rows - are persisted
+@st.cache_data(persist="disk", max_entries=24, show_spinner=False)
+def cached_past_daily_impressions(year, month):
+    return service.get_daily_impressions_for_month(year, month)
+
+def load_daily_impressions(year, month):
+    now = datetime.now()
+    if (year, month) < (now.year, now.month):
+        return cached_past_daily_impressions(year, month)
+    return cached_daily_impressions(year, month)
+
+def clear_leaderboard_caches():
+    """Drop cached leaderboard reads after a write so the next render is fresh"""
+    cached_leaderboard.clear()
+    cached_reddit_leaderboard.clear()
+    cached_total_leaderboard.clear()
+    cached_daily_impressions.clear()
+
+def select_month(key):
+    """Render the month dropdown and return the selected (year, month)"""
+    now = datetime.now()
+    labels, values = month_options(now.strftime("%Y-%m-%d-%H"))
+    if not values:
+        st.info("No historical data available")
+        return now.year, now.month
     
-    with st.form("content_form"):
-        ambassador = st.selectbox("Ambassador", [
-            "Tony", "Emlanis", "Sir Thanos", "Martinezz", 
-            "Beltein", "Odi", "Frifalin", "BlackOwl"
-        ])
-        content_url = st.text_input("Content URL")
-        
-        if st.form_submit_button("Submit Content"):
-            if content_url:
-                with st.spinner("Adding content to database..."):
-                    success, message = service.add_content(ambassador, content_url)
-                if success:
-                    st.success(f"✅ {message}")
-                    time.sleep(3)
-                    st.balloons()
-                    st.rerun()
-                else:
-                    st.error(f"❌ {message}")
-            else:
-                st.error("Please enter a content URL")
+    selected_index = st.selectbox("Select Month:", range(len(labels)), 
+                                format_func=lambda x: labels[x], 
+                                key=key)
+    return values[selected_index]
 
-elif page == "🐦 X Leaderboard":
-    st.title("X Leaderboard")
+@st.cache_resource
+def daily_gains_chart():
+    """Line chart spec for daily impression gains - data is bound per render"""
+    return alt.Chart().mark_line().encode(
+        x=alt.X('Date:T'),
+        y=alt.Y('Daily Impressions Gained:Q')
+    ).properties(height=300)
 
-    # Auto-calculate daily impressions on page load (smart - only when needed)
-    try:
-        success, message = service.auto_calculate_daily_impressions()
-        if success:
-            print(f"📊 Auto-calculated daily impressions: {message}")
-        else:
-            print(f"⚠️ Daily impressions calculation issue: {message}")
-    except Exception as e:
-        print(f"⚠️ Error in auto-calculation: {e}")
+def render_leaderboard(leaderboard, columns, metrics):
+    """Render the metrics row and table for a leaderboard page.
+    columns maps leaderboard keys to display names; metrics is a list of
+    (label, key) summed across ambassadors - "ambassadors" counts the rows."""
+    df = pd.DataFrame(leaderboard)
+    totals = df.drop(columns='name').sum()
+    totals['ambassadors'] = len(df)
+    
+    for metric_col, (label, key) in zip(st.columns(len(metrics)), metrics):
+        with metric_col:
+            st.metric(label, f"{totals[key]:,}")
+    
+    st.divider()
+    
+    # Keep numeric dtypes so column sorting stays numeric; format and label on display only
+    number_cols = [key for key in columns if key != 'name']
+    st.dataframe(df.style.format("{:,}", subset=number_cols), column_config=columns,
+                 use_container_width=True, hide_index=True)
 
+@st.fragment
+def x_leaderboard_view():
+    """X leaderboard and daily gains chart - widgets here rerun only this fragment"""
     # Month selection
-    available_months = service.get_available_months()
-    current_month = datetime.now()
-    
     col1, col2, col3 = st.columns([2, 2, 1])
     with col1:
-        if available_months:
-            month_options = []
-            month_values = []
-            
-            # Add current month option
-            current_option = f"{current_month.strftime('%B %Y')} (Current)"
-            month_options.append(current_option)
-            month_values.append((current_month.year, current_month.month))
-            
-            # Add historical months
-            for year, month in available_months:
-                if not (year == current_month.year and month == current_month.month):
-                    month_name = datetime(year, month, 1).strftime('%B %Y')
-                    month_options.append(month_name)
-                    month_values.append((year, month))
-            
-            selected_index = st.selectbox("Select Month:", range(len(month_options)), 
-                                        format_func=lambda x: month_options[x], 
-                                        key="month_select_x")
-            selected_year, selected_month = month_values[selected_index]
-        else:
-            selected_year, selected_month = current_month.year, current_month.month
-            st.info("No historical data available")
+        selected_year, selected_month = select_month("month_select_x")
     
     with col3:
         if st.button("🔄 Refresh", key="refresh_x"):
-            print("🔄 Refresh button clicked - reloading X leaderboard data...")
-            st.rerun()
+            logger.info("🔄 Refresh button clicked - reloading X leaderboard data...")
+            cached_leaderboard.clear()
+            cached_daily_impressions.clear()
+            cached_past_daily_impressions.clear()
     
     with st.spinner("Loading X leaderboard..."):
-        print("📊 Loading X leaderboard data from database...")
-        leaderboard_result = service.get_leaderboard(selected_year, selected_month)
+        logger.debug("📊 Loading X leaderboard data from database...")
+        try:
+            leaderboard_result = cached_leaderboard(selected_year, selected_month)
+        except Exception:
+            # Logged by the service; failures aren't cached, so Refresh or a rerun retries
+            st.error("❌ Couldn't load the X leaderboard - please try Refresh")
+            return
         
-        # Handle the new return format (leaderboard, total_impressions_all)
-        if isinstance(leaderboard_result, tuple):
-            leaderboard, total_impressions_all = leaderboard_result
-        else:
-            # Fallback for old format
-            leaderboard = leaderboard_result
-            total_impressions_all = sum([amb['total_impressions'] for amb in leaderboard]) if leaderboard else 0
+        # get_leaderboard returns (leaderboard, total_impressions_all), or [] when empty
+        leaderboard = leaderboard_result[0] if isinstance(leaderboard_result, tuple) else leaderboard_result
         
-        print(f"✅ X Leaderboard loaded - Found {len(leaderboard) if leaderboard else 0} ambassadors with final metrics")
+        logger.debug("✅ X Leaderboard loaded - Found %d ambassadors with final metrics", len(leaderboard) if leaderboard else 0)
     
     if leaderboard:
-        total_posts = sum([amb['tweets'] for amb in leaderboard])
-        
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Total Impressions", f"{total_impressions_all:,}")
-        with col2:
-            st.metric("Total Posts", total_posts)
-        with col3:
-            st.metric("Active Ambassadors", len(leaderboard))
-        
-        st.divider()
-        
-        df = pd.DataFrame(leaderboard)
-        df['total_impressions'] = df['total_impressions'].apply(lambda x: f"{x:,}")
-        df['total_likes'] = df['total_likes'].apply(lambda x: f"{x:,}")
-        df['total_replies'] = df['total_replies'].apply(lambda x: f"{x:,}")
-        df['total_retweets'] = df['total_retweets'].apply(lambda x: f"{x:,}")
-        
-        df = df.rename(columns={
+        render_leaderboard(leaderboard, {
             'name': 'Ambassador',
             'tweets': 'Posts',
             'total_impressions': 'Total Impressions',
             'total_likes': 'Total Likes',
             'total_replies': 'Total Replies',
             'total_retweets': 'Total Reposts'
-        })
-        
-        st.dataframe(df, use_container_width=True, hide_index=True)
+        }, [
+            ("Total Impressions", 'total_impressions'),
+            ("Total Posts", 'tweets'),
+            ("Active Ambassadors", 'ambassadors')
+        ])
         
         # Add impressions gained per day graph
         st.divider()
-        selected_month_name = datetime(selected_year, selected_month, 1).strftime("%B %Y")
+        selected_month_name = f"{MONTH_NAMES[selected_month]} {selected_year}"
         st.subheader(f"📊 Daily Impression Gains - {selected_month_name}")
         
         # Get daily impressions data for selected month
         try:
-            daily_data = service.get_daily_impressions_for_month(selected_year, selected_month)
-            
-            # Create date range for entire month (1st to last day)
-            from calendar import monthrange
-            last_day = monthrange(selected_year, selected_month)[1]
-            
-            start_date = datetime(selected_year, selected_month, 1).date()
-            end_date = datetime(selected_year, selected_month, last_day).date()
-            date_range = pd.date_range(start=start_date, end=end_date, freq='D')
-            
-            # Create complete DataFrame with all days of the month
-            complete_data = pd.DataFrame(index=date_range.date)
-            complete_data['Daily Impressions Gained'] = 0
-            complete_data.index.name = 'Date'
+            daily_data = load_daily_impressions(selected_year, selected_month)
             
-            # Fill in actual data
-            if daily_data:
-                for record in daily_data:
-                    record_date = datetime.fromisoformat(record['date']).date()
-                    if record_date in complete_data.index:
-                        complete_data.loc[record_date, 'Daily Impressions Gained'] = record['impressions_gained']
-            
-            # Create line chart
-            st.line_chart(complete_data)
-            
-            # Show summary stats
-            if daily_data:
-                total_gained = sum([record['impressions_gained'] for record in daily_data])
-                avg_daily = total_gained / len(daily_data) if daily_data else 0
+            if not daily_data:
+                now = datetime.now()
+                if selected_year == now.year and selected_month == now.month:
+                    st.info("No daily impression data yet. Click 'Calculate Today' to start tracking!")
+                else:
+                    st.info(f"No daily impression data available for {selected_month_name}")
+            else:
+                # Create date range for entire month (1st to last day)
+                start_date, end_date = month_bounds(selected_year, selected_month)
+                date_range = pd.date_range(start=start_date, end=end_date, freq='D')
+                
+                # Spread actual data over every day of the month, missing days as 0
+                # Two sessions can both record the same day - keep one row per date or reindex fails
+                daily_df = pd.DataFrame(daily_data, columns=['date', 'impressions_gained']).drop_duplicates('date', keep='last')
+                actual = daily_df.set_index(pd.to_datetime(daily_df['date']).dt.normalize())['impressions_gained']
+                complete_data = actual.reindex(date_range, fill_value=0).to_frame('Daily Impressions Gained')
+                complete_data.index.name = 'Date'
                 
+                # Create line chart
+                st.altair_chart(daily_gains_chart().properties(data=complete_data.reset_index()),
+                                use_container_width=True)
+                
+                # Show summary stats
                 col1, col2, col3 = st.columns(3)
                 with col1:
-                    st.metric("Total Gained This Month", f"{total_gained:,}")
+                    st.metric("Total Gained This Month", f"{actual.sum():,}")
                 with col2:
-                    st.metric("Average Daily Gain", f"{avg_daily:,.0f}")
+                    st.metric("Average Daily Gain", f"{actual.mean():,.0f}")
                 with col3:
-                    st.metric("Days Tracked", len(daily_data))
-            else:
-                if selected_year == datetime.now().year and selected_month == datetime.now().month:
-                    st.info("No daily impression data yet. Click 'Calculate Today' to start tracking!")
-                else:
-                    st.info(f"No daily impression data available for {selected_month_name}")
+                    st.metric("Days Tracked", len(actual))
                 
         except Exception as e:
             st.info("Chart data temporarily unavailable")
@@ -212,164 +253,131 @@ elif page == "🐦 X Leaderboard":
     else:
         st.info("📝 **No X leaderboard data yet!**")
 
-elif page == "🟠 Reddit Leaderboard":
-    st.title("Reddit Leaderboard")
-    
+@st.fragment
+def reddit_leaderboard_view():
+    """Reddit leaderboard - widgets here rerun only this fragment"""
     # Month selection
-    available_months = service.get_available_months()
-    current_month = datetime.now()
-    
     col1, col2, col3 = st.columns([2, 2, 1])
     with col1:
-        if available_months:
-            month_options = []
-            month_values = []
-            
-            # Add current month option
-            current_option = f"{current_month.strftime('%B %Y')} (Current)"
-            month_options.append(current_option)
-            month_values.append((current_month.year, current_month.month))
-            
-            # Add historical months
-            for year, month in available_months:
-                if not (year == current_month.year and month == current_month.month):
-                    month_name = datetime(year, month, 1).strftime('%B %Y')
-                    month_options.append(month_name)
-                    month_values.append((year, month))
-            
-            selected_index = st.selectbox("Select Month:", range(len(month_options)), 
-                                        format_func=lambda x: month_options[x], 
-                                        key="month_select_reddit")
-            selected_year, selected_month = month_values[selected_index]
-        else:
-            selected_year, selected_month = current_month.year, current_month.month
-            st.info("No historical data available")
+        selected_year, selected_month = select_month("month_select_reddit")
     
     with col3:
         if st.button("🔄 Refresh", key="refresh_reddit"):
             with st.spinner("Refreshing Reddit stats..."):
-                print("🔄 Refresh button clicked - updating Reddit stats and reloading data...")
+                logger.info("🔄 Refresh button clicked - updating Reddit stats and reloading data...")
                 success, message = service.update_reddit_stats()
+                cached_reddit_leaderboard.clear()
+                cached_total_leaderboard.clear()
                 if success:
                     st.success(f"✅ {message}")
-                    time.sleep(1)
                 else:
                     st.error(f"❌ {message}")
-                    time.sleep(2)
-                st.rerun()
     
     with st.spinner("Loading Reddit leaderboard..."):
-        print("📊 Loading Reddit leaderboard data from database...")
-        leaderboard = service.get_reddit_leaderboard(selected_year, selected_month)
-        print(f"✅ Reddit Leaderboard loaded - Found {len(leaderboard) if leaderboard else 0} ambassadors with final metrics")
+        logger.debug("📊 Loading Reddit leaderboard data from database...")
+        try:
+            leaderboard = cached_reddit_leaderboard(selected_year, selected_month)
+        except Exception:
+            # Logged by the service; failures aren't cached, so Refresh or a rerun retries
+            st.error("❌ Couldn't load the Reddit leaderboard - please try Refresh")
+            return
+        logger.debug("✅ Reddit Leaderboard loaded - Found %d ambassadors with final metrics", len(leaderboard) if leaderboard else 0)
     
     if leaderboard:
-        total_score = sum([amb['total_score'] for amb in leaderboard])
-        total_posts = sum([amb['posts'] for amb in leaderboard])
-        total_comments = sum([amb['total_comments'] for amb in leaderboard])
-        total_views = sum([amb['total_views'] for amb in leaderboard])
-        
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            st.metric("Total Score", f"{total_score:,}")
-        with col2:
-            st.metric("Total Posts", total_posts)
-        with col3:
-            st.metric("Total Comments", f"{total_comments:,}")
-        with col4:
-            st.metric("Total Views", f"{total_views:,}")
-        
-        st.divider()
-        
-        df = pd.DataFrame(leaderboard)
-        df['total_score'] = df['total_score'].apply(lambda x: f"{x:,}")
-        df['total_comments'] = df['total_comments'].apply(lambda x: f"{x:,}")
-        df['total_views'] = df['total_views'].apply(lambda x: f"{x:,}")
-        
-        df = df.rename(columns={
+        render_leaderboard(leaderboard, {
             'name': 'Ambassador',
             'posts': 'Posts',
             'total_score': 'Score',
             'total_comments': 'Total Comments',
             'total_views': 'Total Views'
-        })
-        
-        st.dataframe(df, use_container_width=True, hide_index=True)
+        }, [
+            ("Total Score", 'total_score'),
+            ("Total Posts", 'posts'),
+            ("Total Comments", 'total_comments'),
+            ("Total Views", 'total_views')
+        ])
         
     else:
         st.info("📝 **No Reddit leaderboard data yet!**")
 
-elif page == "🏆 Total Leaderboard":
-    st.title("Total Leaderboard (Views)")
-    
+@st.fragment
+def total_leaderboard_view():
+    """Combined views leaderboard - widgets here rerun only this fragment"""
     # Month selection
-    available_months = service.get_available_months()
-    current_month = datetime.now()
-    
     col1, col2, col3 = st.columns([2, 2, 1])
     with col1:
-        if available_months:
-            month_options = []
-            month_values = []
-            
-            # Add current month option
-            current_option = f"{current_month.strftime('%B %Y')} (Current)"
-            month_options.append(current_option)
-            month_values.append((current_month.year, current_month.month))
-            
-            # Add historical months
-            for year, month in available_months:
-                if not (year == current_month.year and month == current_month.month):
-                    month_name = datetime(year, month, 1).strftime('%B %Y')
-                    month_options.append(month_name)
-                    month_values.append((year, month))
-            
-            selected_index = st.selectbox("Select Month:", range(len(month_options)), 
-                                        format_func=lambda x: month_options[x], 
-                                        key="month_select_total")
-            selected_year, selected_month = month_values[selected_index]
-        else:
-            selected_year, selected_month = current_month.year, current_month.month
-            st.info("No historical data available")
+        selected_year, selected_month = select_month("month_select_total")
     
     with col3:
         if st.button("🔄 Refresh", key="refresh_total"):
-            print("🔄 Refresh button clicked - reloading Total leaderboard data...")
-            st.rerun()
+            logger.info("🔄 Refresh button clicked - reloading Total leaderboard data...")
+            cached_total_leaderboard.clear()
     
     with st.spinner("Loading Total leaderboard..."):
-        print("📊 Loading Total leaderboard data from database...")
-        leaderboard = service.get_total_leaderboard(selected_year, selected_month)
-        print(f"✅ Total Leaderboard loaded - Found {len(leaderboard) if leaderboard else 0} ambassadors with combined metrics")
+        logger.debug("📊 Loading Total leaderboard data from database...")
+        leaderboard = cached_total_leaderboard(selected_year, selected_month)
+        logger.debug("✅ Total Leaderboard loaded - Found %d ambassadors with combined metrics", len(leaderboard) if leaderboard else 0)
     
     if leaderboard:
-        total_x_views = sum([amb['x_views'] for amb in leaderboard])
-        total_reddit_views = sum([amb['reddit_views'] for amb in leaderboard])
-        total_combined_views = sum([amb['total_views'] for amb in leaderboard])
-        
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Total X Views", f"{total_x_views:,}")
-        with col2:
-            st.metric("Total Reddit Views", f"{total_reddit_views:,}")
-        with col3:
-            st.metric("Total Combined Views", f"{total_combined_views:,}")
-        
-        st.divider()
-        
-        df = pd.DataFrame(leaderboard)
-        df['x_views'] = df['x_views'].apply(lambda x: f"{x:,}")
-        df['reddit_views'] = df['reddit_views'].apply(lambda x: f"{x:,}")
-        df['total_views'] = df['total_views'].apply(lambda x: f"{x:,}")
-        
-        df = df.rename(columns={
+        render_leaderboard(leaderboard, {
             'name': 'Ambassador',
             'x_views': 'X Views',
             'reddit_views': 'Reddit Views',
             'total_views': 'Total Views'
-        })
-        
-        st.dataframe(df, use_container_width=True, hide_index=True)
+        }, [
+            ("Total X Views", 'x_views'),
+            ("Total Reddit Views", 'reddit_views'),
+            ("Total Combined Views", 'total_views')
+        ])
         
     else:
-        st.info("📝 **No total leaderboard data yet!**")
\ No newline at end of file
+        st.info("📝 **No total leaderboard data yet!**")
+
+page = st.sidebar.selectbox("Navigation", NAV_PAGES)
+
+if page == "✨ Submit Content":
+    st.title("✍️ Submit New Content")
+    
+    with st.form("content_form"):
+        ambassador = st.selectbox("Ambassador", AMBASSADORS)
+        content_url = st.text_input("Content URL")
+        
+        if st.form_submit_button("Submit Content"):
+            if content_url:
+                with st.spinner("Adding content to database..."):
+                    success, message = service.add_content(ambassador, content_url)
+                if success:
+                    clear_leaderboard_caches()
+                    st.success(f"✅ {message}")
+                    st.balloons()
+                else:
+                    st.error(f"❌ {message}")
+            else:
+                st.error("Please enter a content URL")
+
+elif page == "🐦 X Leaderboard":
+    st.title("X Leaderboard")
+
+    # Auto-calculate daily impressions at most once an hour per session -
+    # the service only refreshes hourly anyway, so skip the DB check on reruns
+    if time.time() - st.session_state.get('last_auto_calc', 0) > 3600:
+        try:
+            success, message = service.auto_calculate_daily_impressions()
+            if success:
+                cached_daily_impressions.clear()
+                logger.info("📊 Auto-calculated daily impressions: %s", message)
+            else:
+                logger.warning("⚠️ Daily impressions calculation issue: %s", message)
+        except Exception as e:
+            logger.warning("⚠️ Error in auto-calculation: %s", e)
+        st.session_state['last_auto_calc'] = time.time()
+    
+    x_leaderboard_view()
+
+elif page == "🟠 Reddit Leaderboard":
+    st.title("Reddit Leaderboard")
+    reddit_leaderboard_view()
+
+elif page == "🏆 Total Leaderboard":
+    st.title("Total Leaderboard (Views)")
+    total_leaderboard_view()
@@ -0,0 +1,11 @@
+-- Partial indexes matching the ambassadors filters used by UpdateService
+
+-- get_ready_tweets / get_update_stats: date_posted is null and "Submitted_Date" < cutoff
+create index if not exists ambassadors_ready_idx
+    on public.ambassadors ("Submitted_Date")
+    where date_posted is null;
+
+-- Leaderboards and month list: date_posted is not null, filtered by month
+create index if not exists ambassadors_posted_idx
+    on public.ambassadors (date_posted)
+    where date_posted is not null;
@@ -0,0 +1,55 @@
+-- Per-ambassador leaderboards aggregated in Postgres, called via rpc() from UpdateService
+-- Both take an optional inclusive date range; null bounds mean "all time"
+
+create or replace function public.x_leaderboard(start_date date default null, end_date date default null)
+returns table (
+    name text,
+    tweets bigint,
+    total_impressions bigint,
+    total_likes bigint,
+    total_replies bigint,
+    total_retweets bigint
+)
+language sql
+stable
+as $$
+    select "Ambassador",
+           count(*),
+           coalesce(sum("Impressions"), 0)::bigint,
+           coalesce(sum("Likes"), 0)::bigint,
+           coalesce(sum("Replies"), 0)::bigint,
+           coalesce(sum("Retweets"), 0)::bigint
+    from public.ambassadors
+    where date_posted is not null
+      and (start_date is null or date_posted >= start_date)
+      and (end_date is null or date_posted <= end_date)
+    group by "Ambassador"
+    order by 3 desc, 1;
+$$;
+
+create or replace function public.reddit_leaderboard(start_date date default null, end_date date default null)
+returns table (
+    name text,
+    posts bigint,
+    total_score bigint,
+    total_comments bigint,
+    total_views bigint
+)
+language sql
+stable
+as $$
+    select poster,
+           count(*),
+           coalesce(sum("Score"), 0)::bigint,
+           coalesce(sum("Comments"), 0)::bigint,
+           coalesce(sum("Views"), 0)::bigint
+    from public.reddit
+    where "Score" is not null
+      and (start_date is null or submitted_at >= start_date)
+      and (end_date is null or submitted_at <= end_date)
+    group by poster
+    order by 3 desc, 1;
+$$;
+
+grant execute on function public.x_leaderboard(date, date) to anon, authenticated;
+grant execute on function public.reddit_leaderboard(date, date) to anon, authenticated;
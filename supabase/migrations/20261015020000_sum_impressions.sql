@@ -0,0 +1,11 @@
+-- Running total of X impressions, used by the daily impressions tracker via rpc("sum_impressions")
+
+create or replace function public.sum_impressions()
+returns bigint
+language sql
+stable
+as $$
+    select coalesce(sum("Impressions"), 0)::bigint from public.ambassadors;
+$$;
+
+grant execute on function public.sum_impressions() to anon, authenticated;
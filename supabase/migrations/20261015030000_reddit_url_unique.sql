@@ -0,0 +1,10 @@
+-- add_new_reddit_post upserts on url (on_conflict="url"), which needs a unique index to target
+-- The old check-then-insert could race and store a url twice - keep the oldest row for each url
+-- (the first submission) before adding the index
+delete from public.reddit newer
+using public.reddit older
+where newer.url = older.url
+  and newer.id > older.id;
+
+create unique index if not exists reddit_url_key
+    on public.reddit (url);
@@ -0,0 +1,13 @@
+-- Tweets waiting for their final metrics update: not posted yet and submitted over 3 days ago
+-- days_old is computed here so get_ready_tweets doesn't parse Submitted_Date client-side
+
+create or replace view public.ready_tweets_v
+with (security_invoker = true)
+as
+select *,
+       extract(day from now() - "Submitted_Date")::int as days_old
+from public.ambassadors
+where date_posted is null
+  and "Submitted_Date" < now() - interval '3 days';
+
+grant select on public.ready_tweets_v to anon, authenticated;
@@ -0,0 +1,12 @@
+-- daily_impressions is looked up by exact date (today / yesterday) and by month range for the chart
+-- The ambassadors "ready" partial index lives in 20261015000000_ambassadors_filter_indexes.sql
+
+-- One row per day: calculate_daily_impressions upserts on date (on_conflict="date").
+-- Drop duplicates left by concurrent inserts first, keeping the newest row for each date
+delete from public.daily_impressions older
+using public.daily_impressions newer
+where older.date = newer.date
+  and older.id < newer.id;
+
+create unique index if not exists daily_impressions_date_key
+    on public.daily_impressions (date);
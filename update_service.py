@@ -1,11 +1,56 @@
+import logging
 import os
-from datetime import datetime, timedelta
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from calendar import monthrange
+from datetime import date, datetime, timedelta, timezone
 from dotenv import load_dotenv
+import httpx
+from postgrest.exceptions import APIError
 from supabase import create_client
 import streamlit as st
 import praw
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
 
-load_dotenv()
+logger = logging.getLogger(__name__)
+
+# Numeric status ID from any x.com / twitter.com style post URL
+_TWEET_ID_RE = re.compile(r"/status/(\d+)")
+
+# Any supported X/Twitter host - fxtwitter is listed before twitter so it's matched whole
+_X_HOST_RE = re.compile(r"(?:fxtwitter|fixupx|twitter|x)\.com", re.IGNORECASE)
+
+# HTTP statuses worth retrying - postgrest puts the status in APIError.code when the body isn't JSON
+_TRANSIENT_STATUS_CODES = {"429", "500", "502", "503", "504", "520"}
+# Of those, the ones where the request was turned away before it reached the database
+_REJECTED_STATUS_CODES = {"429", "503"}
+
+def _is_transient(error):
+    """Rate limits, gateway errors and dropped connections - anything else fails straight away"""
+    if isinstance(error, APIError):
+        return str(error.code) in _TRANSIENT_STATUS_CODES
+    return isinstance(error, httpx.TransportError)
+
+def _is_rejected(error):
+    """Refused without running - the only failures where resending a write can't find its own row"""
+    return isinstance(error, APIError) and str(error.code) in _REJECTED_STATUS_CODES
+
+def _backoff(predicate):
+    # Exponential backoff with jitter so concurrent sessions don't retry in lockstep
+    return retry(
+        retry=retry_if_exception(predicate),
+        wait=wait_exponential_jitter(initial=0.25, max=4),
+        stop=stop_after_attempt(5),
+        reraise=True,
+    )
+
+def month_bounds(year=None, month=None):
+    """Inclusive (start, end) ISO dates for a month, or (None, None) for all time"""
+    if not (year and month):
+        return None, None
+    last_day = monthrange(year, month)[1]
+    return date(year, month, 1).isoformat(), date(year, month, last_day).isoformat()
 
 class UpdateService:
     def __init__(self):
@@ -16,7 +61,9 @@ class UpdateService:
             reddit_client_id = st.secrets.get("REDDIT_CLIENT_ID")
             reddit_client_secret = st.secrets.get("REDDIT_CLIENT_SECRET") 
             reddit_user_agent = st.secrets.get("REDDIT_USER_AGENT")
-        except:
+        except Exception:
+            # Local development - only read .env when secrets aren't configured
+            load_dotenv()
             url = os.getenv("SUPABASE_URL")
             key = os.getenv("SUPABASE_ANON_KEY")
             reddit_client_id = os.getenv("REDDIT_CLIENT_ID")
@@ -32,25 +79,32 @@ class UpdateService:
                 client_secret=reddit_client_secret,
                 user_agent=reddit_user_agent
             )
-            print("☁️ Streamlit Cloud service initialized with Reddit API")
+            logger.info("☁️ Streamlit Cloud service initialized with Reddit API")
         except Exception as e:
-            print(f"⚠️ Reddit API initialization failed: {e}")
+            logger.warning("⚠️ Reddit API initialization failed: %s", e)
             self.reddit = None
     
+    @_backoff(_is_transient)
+    def _execute(self, query):
+        """Execute a query or rpc call, retrying rate limits and transient failures"""
+        return query.execute()
+    
+    @_backoff(_is_rejected)
+    def _execute_submission(self, query):
+        """Execute an ignore-duplicates upsert. Lost responses aren't retried - the retry would
+        find the row the first attempt wrote and report the user's own submission as a duplicate"""
+        return query.execute()
+    
     def extract_tweet_id(self, tweet_url):
-        try:
-            if "/status/" in tweet_url:
-                return tweet_url.split("/status/")[-1].split("?")[0]
-            return None
-        except:
-            return None
+        match = _TWEET_ID_RE.search(tweet_url)
+        return match.group(1) if match else None
     
     def extract_reddit_id(self, reddit_url):
         try:
             if "/comments/" in reddit_url:
                 return reddit_url.split("/comments/")[-1].split("/")[0]
             return None
-        except:
+        except Exception:
             return None
     
     def add_new_tweet(self, ambassador, tweet_url):
@@ -59,16 +113,13 @@ class UpdateService:
             if not tweet_id:
                 return False, "Invalid tweet URL format"
             
-            existing = self.supabase.table("ambassadors").select("id").eq("Tweet_URL", tweet_url).execute()
-            if existing.data:
-                return False, "Tweet URL already exists"
-            
+            now_iso = datetime.now(timezone.utc).isoformat()
             tweet_data = {
                 "Ambassador": ambassador,
                 "Tweet_ID": tweet_id,
                 "Tweet_URL": tweet_url,
-                "Submitted_Date": datetime.now().isoformat(),
-                "Last_Updated": datetime.now().isoformat(),
+                "Submitted_Date": now_iso,
+                "Last_Updated": now_iso,
                 "Final_Update": False,
                 "Impressions": 0,
                 "Likes": 0,
@@ -76,14 +127,20 @@ class UpdateService:
                 "Replies": 0
             }
             
-            result = self.supabase.table("ambassadors").insert(tweet_data).execute()
-            return True, f"Tweet added for {ambassador}" if result.data else (False, "Failed to insert")
+            # Single round trip - the unique Tweet_ID constraint does the duplicate check,
+            # and an ignored duplicate comes back with no rows
+            result = self._execute_submission(self.supabase.table("ambassadors").upsert(tweet_data, on_conflict="Tweet_ID", ignore_duplicates=True))
+            if not result.data:
+                return False, "Link has been added already"
+            return True, f"Tweet added for {ambassador}"
                 
-        except Exception as e:
-            error_msg = str(e)
-            if "duplicate key value violates unique constraint" in error_msg and "Tweet_ID" in error_msg:
+        except APIError as e:
+            # 23505 is Postgres' unique_violation
+            if e.code == "23505":
                 return False, "Link has been added already"
-            return False, f"Database error: {error_msg}"
+            return False, f"Database error: {e.message}"
+        except Exception as e:
+            return False, f"Database error: {str(e)}"
     
     def add_new_reddit_post(self, ambassador, reddit_url):
         try:
@@ -92,133 +149,85 @@ class UpdateService:
             if not post_id:
                 return False, "Invalid Reddit URL format"
             
-            existing = self.supabase.table("reddit").select("id").eq("url", reddit_url).execute()
-            if existing.data:
-                return False, "Reddit URL already exists"
-            
             reddit_data = {
                 "poster": ambassador,
                 "url": reddit_url,
-                "submitted_at": datetime.now().isoformat()
+                "submitted_at": datetime.now(timezone.utc).isoformat()
             }
             
-            result = self.supabase.table("reddit").insert(reddit_data).execute()
-            return True, f"Reddit post added for {ambassador}" if result.data else (False, "Failed to insert")
+            # Single round trip - the unique url index does the duplicate check,
+            # and an ignored duplicate comes back with no rows
+            result = self._execute_submission(self.supabase.table("reddit").upsert(reddit_data, on_conflict="url", ignore_duplicates=True))
+            if not result.data:
+                return False, "Reddit URL already exists"
+            return True, f"Reddit post added for {ambassador}"
                 
-        except Exception as e:
-            error_msg = str(e)
-            if "duplicate key value violates unique constraint" in error_msg:
+        except APIError as e:
+            # 23505 is Postgres' unique_violation
+            if e.code == "23505":
                 return False, "Link has been added already"
-            return False, f"Database error: {error_msg}"
+            return False, f"Database error: {e.message}"
+        except Exception as e:
+            return False, f"Database error: {str(e)}"
+    
+    def _fetch_all(self, build_query, batch_size=1000):
+        """Run a select page by page so results aren't cut off at PostgREST's row limit"""
+        rows = []
+        while True:
+            # Query builders mutate in place, so every page starts from a fresh one
+            page = self._execute(build_query().order("id").range(len(rows), len(rows) + batch_size - 1)).data or []
+            # Stop on an empty page, not a short one - a server max-rows below batch_size
+            # makes every page short
+            if not page:
+                return rows
+            rows.extend(page)
     
     def get_leaderboard(self, year=None, month=None):
         try:
-            query = self.supabase.table("ambassadors").select("*").not_.is_("date_posted", "null")
-            
-            # Filter by month/year if provided
-            if year and month:
-                # Get start and end of month
-                start_date = datetime(year, month, 1).date()
-                from calendar import monthrange
-                last_day = monthrange(year, month)[1]
-                end_date = datetime(year, month, last_day).date()
-                
-                query = query.gte("date_posted", start_date.isoformat()).lte("date_posted", end_date.isoformat())
-            
-            result = query.execute()
+            # Aggregated per ambassador in Postgres - see supabase/migrations/*_leaderboard_functions.sql
+            start_date, end_date = month_bounds(year, month)
+            result = self._execute(self.supabase.rpc("x_leaderboard", {"start_date": start_date, "end_date": end_date}))
             if not result.data:
                 return []
             
-            ambassador_stats = {}
-            total_impressions_all = 0  # Track total from ALL posts for top metric
-            
-            for tweet in result.data:
-                name = tweet["Ambassador"]
-                if name not in ambassador_stats:
-                    ambassador_stats[name] = {
-                        "name": name,
-                        "tweets": 0,
-                        "total_impressions": 0,
-                        "total_likes": 0,
-                        "total_replies": 0,
-                        "total_retweets": 0
-                    }
-                
-                ambassador_stats[name]["tweets"] += 1
-                ambassador_stats[name]["total_impressions"] += tweet["Impressions"]
-                ambassador_stats[name]["total_likes"] += tweet["Likes"]
-                ambassador_stats[name]["total_replies"] += tweet["Replies"]
-                ambassador_stats[name]["total_retweets"] += tweet["Retweets"]
-                
-                # Always add to total for top metric (regardless of 500+ filter)
-                total_impressions_all += tweet["Impressions"]
-            
-            leaderboard = list(ambassador_stats.values())
-            leaderboard.sort(key=lambda x: x["total_impressions"], reverse=True)
-            
             # Add the unfiltered total to the return data
-            return leaderboard, total_impressions_all
-        except:
-            return [], 0
+            return result.data, sum(row["total_impressions"] for row in result.data)
+        except Exception as e:
+            # Re-raise so the app's cache doesn't store a failure as an empty board
+            logger.error("❌ X leaderboard error: %s", e)
+            raise
     
     def get_reddit_leaderboard(self, year=None, month=None):
         try:
-            query = self.supabase.table("reddit").select("*").not_.is_("Score", "null")
-            
-            # Filter by month/year if provided
-            if year and month:
-                # Get start and end of month
-                start_date = datetime(year, month, 1).date()
-                from calendar import monthrange
-                last_day = monthrange(year, month)[1]
-                end_date = datetime(year, month, last_day).date()
-                
-                query = query.gte("submitted_at", start_date.isoformat()).lte("submitted_at", end_date.isoformat())
-            
-            result = query.execute()
-            print(f"🔍 Reddit query result: {result.data}")  # Debug print
-            if not result.data:
-                return []
-            
-            ambassador_stats = {}
-            for post in result.data:
-                name = post["poster"]  # Use correct column name
-                print(f"🔍 Processing post: {name} - Score: {post.get('Score', 0)}")  # Debug print
-                if name not in ambassador_stats:
-                    ambassador_stats[name] = {
-                        "name": name,
-                        "posts": 0,
-                        "total_score": 0,
-                        "total_comments": 0,
-                        "total_views": 0
-                    }
-                
-                ambassador_stats[name]["posts"] += 1
-                ambassador_stats[name]["total_score"] += post.get("Score", 0)
-                ambassador_stats[name]["total_comments"] += post.get("Comments", 0) if post.get("Comments") else 0
-                ambassador_stats[name]["total_views"] += post.get("Views", 0) if post.get("Views") else 0
-            
-            leaderboard = list(ambassador_stats.values())
-            leaderboard.sort(key=lambda x: x["total_score"], reverse=True)
-            print(f"🔍 Final leaderboard: {leaderboard}")  # Debug print
-            return leaderboard
+            # Aggregated per poster in Postgres - see supabase/migrations/*_leaderboard_functions.sql
+            start_date, end_date = month_bounds(year, month)
+            result = self._execute(self.supabase.rpc("reddit_leaderboard", {"start_date": start_date, "end_date": end_date}))
+            logger.debug("🔍 Reddit leaderboard rows: %d", len(result.data or []))
+            return result.data or []
         except Exception as e:
-            print(f"❌ Reddit leaderboard error: {e}")  # Debug print
-            return []
+            # Re-raise so the app's cache doesn't store a failure as an empty board
+            logger.error("❌ Reddit leaderboard error: %s", e)
+            raise
     
     def get_update_stats(self):
         try:
-            all_tweets = self.supabase.table("ambassadors").select("*").execute()
+            # HEAD requests with an exact count - only the row count comes back, no rows
+            all_query = self.supabase.table("ambassadors").select("id", count="exact", head=True)
             # Changed from Final_Update = True to date_posted is not NULL
-            updated_tweets = self.supabase.table("ambassadors").select("*").not_.is_("date_posted", "null").execute()
-            cutoff_date = datetime.now() - timedelta(days=3)
+            updated_query = self.supabase.table("ambassadors").select("id", count="exact", head=True).not_.is_("date_posted", "null")
+            cutoff_date = datetime.now(timezone.utc) - timedelta(days=3)
             cutoff_iso = cutoff_date.isoformat()
             # Changed from Final_Update = False to date_posted is NULL
-            ready_tweets = self.supabase.table("ambassadors").select("*").is_("date_posted", "null").lt("Submitted_Date", cutoff_iso).execute()
+            ready_query = self.supabase.table("ambassadors").select("id", count="exact", head=True).is_("date_posted", "null").lt("Submitted_Date", cutoff_iso)
             
-            total = len(all_tweets.data) if all_tweets.data else 0
-            updated = len(updated_tweets.data) if updated_tweets.data else 0
-            ready = len(ready_tweets.data) if ready_tweets.data else 0
+            # The three counts are independent - run them concurrently so the wait is one round trip
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                all_tweets, updated_tweets, ready_tweets = executor.map(
+                    self._execute, (all_query, updated_query, ready_query))
+            
+            total = all_tweets.count or 0
+            updated = updated_tweets.count or 0
+            ready = ready_tweets.count or 0
             
             return {
                 "total_tweets": total,
@@ -226,21 +235,17 @@ class UpdateService:
                 "tweets_ready_for_update": ready,
                 "tweets_under_3_days": max(0, total - updated - ready)
             }
-        except:
+        except Exception:
             return {"total_tweets": 0, "tweets_updated": 0, "tweets_ready_for_update": 0, "tweets_under_3_days": 0}
     
     def normalize_x_url(self, url):
         """Convert various X/Twitter URL formats to standard x.com format"""
-        # Replace various X/Twitter domains with x.com
-        url = url.replace("twitter.com", "x.com")
-        url = url.replace("fixupx.com", "x.com")
-        url = url.replace("fxtwitter.com", "x.com")
-        return url
+        # Replace various X/Twitter domains with x.com in a single pass
+        return _X_HOST_RE.sub("x.com", url)
     
     def is_x_url(self, url):
         """Check if URL is from X/Twitter (any supported format)"""
-        url_lower = url.lower()
-        return any(domain in url_lower for domain in ["x.com", "twitter.com", "fixupx.com", "fxtwitter.com"])
+        return _X_HOST_RE.search(url) is not None
     
     def add_content(self, ambassador, content_url):
         """Unified method to add content - detects platform from URL"""
@@ -249,10 +254,10 @@ class UpdateService:
             if self.is_x_url(content_url):
                 # Normalize X URL to x.com format
                 normalized_url = self.normalize_x_url(content_url)
-                print(f"🐦 X content added for {ambassador}")
+                logger.info("🐦 X content added for %s", ambassador)
                 return self.add_new_tweet(ambassador, normalized_url)
             elif "reddit.com" in content_url.lower():
-                print(f"📱 Reddit content added for {ambassador}")
+                logger.info("📱 Reddit content added for %s", ambassador)
                 return self.add_new_reddit_post(ambassador, content_url)
             else:
                 return False, "Unsupported platform. Please use X (Twitter) or Reddit URLs."
@@ -261,32 +266,29 @@ class UpdateService:
     
     def get_ready_tweets(self):
         try:
-            cutoff_date = datetime.now() - timedelta(days=3)
-            cutoff_iso = cutoff_date.isoformat()
             # Changed from Final_Update = False to date_posted is NULL
-            result = self.supabase.table("ambassadors").select("*").is_("date_posted", "null").lt("Submitted_Date", cutoff_iso).execute()
-            ready_tweets = result.data if result.data else []
-            
-            for tweet in ready_tweets:
-                submitted = datetime.fromisoformat(tweet["Submitted_Date"].replace("Z", "+00:00").replace("+00:00", ""))
-                age_days = (datetime.now() - submitted).days
-                tweet["days_old"] = age_days
+            # ready_tweets_v applies the 3-day cutoff and computes days_old in Postgres
+            ready_tweets = self._fetch_all(lambda: self.supabase.table("ready_tweets_v").select("Ambassador, Tweet_URL, Submitted_Date, Tweet_ID, days_old"))
             
             return ready_tweets
-        except:
+        except Exception:
             return []
     
+    def get_total_impressions(self):
+        """Sum of Impressions over all tweets, computed in Postgres"""
+        result = self._execute(self.supabase.rpc("sum_impressions"))
+        return result.data or 0
+    
     def calculate_daily_impressions(self, force_update=False):
         """Calculate and store daily impression gains"""
         try:
             today = datetime.now().date()
             
             # Get total impressions from all tweets today
-            all_tweets = self.supabase.table("ambassadors").select("Impressions").execute()
-            current_total = sum([tweet.get("Impressions", 0) for tweet in all_tweets.data]) if all_tweets.data else 0
+            current_total = self.get_total_impressions()
             
             # Check if today's record already exists
-            existing = self.supabase.table("daily_impressions").select("*").eq("date", today.isoformat()).execute()
+            existing = self._execute(self.supabase.table("daily_impressions").select("id").eq("date", today.isoformat()))
             
             if existing.data:
                 # Update existing record - calculate gain from yesterday's total
@@ -294,28 +296,28 @@ class UpdateService:
                 
                 # Get yesterday's total to calculate proper gain
                 yesterday = today - timedelta(days=1)
-                yesterday_record = self.supabase.table("daily_impressions").select("total_impressions").eq("date", yesterday.isoformat()).execute()
+                yesterday_record = self._execute(self.supabase.table("daily_impressions").select("total_impressions").eq("date", yesterday.isoformat()))
                 
                 if yesterday_record.data:
                     yesterday_total = yesterday_record.data[0]["total_impressions"]
                     impressions_gained = current_total - yesterday_total
-                    print(f"🔍 DEBUG: Today: {current_total}, Yesterday: {yesterday_total}, Gained: {impressions_gained}")
+                    logger.debug("🔍 Today: %s, Yesterday: %s, Gained: %s", current_total, yesterday_total, impressions_gained)
                 else:
                     # If no yesterday record, assume yesterday was 0
                     impressions_gained = current_total
-                    print(f"🔍 DEBUG: No yesterday record - Today: {current_total}, Gained: {impressions_gained}")
+                    logger.debug("🔍 No yesterday record - Today: %s, Gained: %s", current_total, impressions_gained)
                 
-                self.supabase.table("daily_impressions").update({
+                self._execute(self.supabase.table("daily_impressions").update({
                     "total_impressions": current_total,
                     "impressions_gained": max(0, impressions_gained)  # Ensure non-negative
-                }).eq("id", record_id).execute()
+                }).eq("id", record_id))
                 
-                print(f"📊 Updated daily impressions: +{impressions_gained} (Total: {current_total})")
+                logger.info("📊 Updated daily impressions: +%s (Total: %s)", impressions_gained, current_total)
                 return True, f"Daily impressions updated: +{impressions_gained}"
             else:
                 # Get yesterday's total to calculate gain
                 yesterday = today - timedelta(days=1)
-                yesterday_record = self.supabase.table("daily_impressions").select("total_impressions").eq("date", yesterday.isoformat()).execute()
+                yesterday_record = self._execute(self.supabase.table("daily_impressions").select("total_impressions").eq("date", yesterday.isoformat()))
                 
                 if yesterday_record.data:
                     # Normal case: calculate gain from yesterday
@@ -324,46 +326,46 @@ class UpdateService:
                 else:
                     # First run: set gained to 0 (baseline)
                     impressions_gained = 0
-                    print("📊 First run detected - setting baseline with 0 gained impressions")
+                    logger.info("📊 First run detected - setting baseline with 0 gained impressions")
                 
-                # Insert new record
-                self.supabase.table("daily_impressions").insert({
+                # Insert new record - upsert on the unique date, so a concurrent session
+                # recording the same day overwrites it instead of adding a second row
+                self._execute(self.supabase.table("daily_impressions").upsert({
                     "date": today.isoformat(),
                     "total_impressions": current_total,
                     "impressions_gained": max(0, impressions_gained)  # Ensure non-negative
-                }).execute()
+                }, on_conflict="date"))
                 
                 if yesterday_record.data:
-                    print(f"📊 New daily impressions record: +{impressions_gained} (Total: {current_total})")
+                    logger.info("📊 New daily impressions record: +%s (Total: %s)", impressions_gained, current_total)
                     return True, f"Daily impressions recorded: +{impressions_gained}"
                 else:
-                    print(f"📊 Baseline set: {current_total} total impressions")
+                    logger.info("📊 Baseline set: %s total impressions", current_total)
                     return True, f"Baseline established: {current_total} total impressions (0 gained today)"
                 
         except Exception as e:
-            print(f"❌ Error calculating daily impressions: {e}")
+            logger.error("❌ Error calculating daily impressions: %s", e)
             return False, f"Error: {str(e)}"
     
     def get_daily_impressions_for_month(self, year=None, month=None):
-        """Get daily impression gains for a specific month"""
+        """Get daily impression gains for a specific month.
+        Raises on a failed read, so callers can cache [] as a real "no data" answer"""
         try:
+            now = datetime.now()
             if not year:
-                year = datetime.now().year
+                year = now.year
             if not month:
-                month = datetime.now().month
+                month = now.month
                 
             # Get start and end of month
-            start_date = datetime(year, month, 1).date()
-            from calendar import monthrange
-            last_day = monthrange(year, month)[1]
-            end_date = datetime(year, month, last_day).date()
+            start_date, end_date = month_bounds(year, month)
             
-            result = self.supabase.table("daily_impressions").select("date, impressions_gained").gte("date", start_date.isoformat()).lte("date", end_date.isoformat()).order("date").execute()
+            result = self._execute(self.supabase.table("daily_impressions").select("date, impressions_gained").gte("date", start_date).lte("date", end_date).order("date"))
             
             return result.data if result.data else []
         except Exception as e:
-            print(f"❌ Error fetching daily impressions: {e}")
-            return []
+            logger.error("❌ Error fetching daily impressions: %s", e)
+            raise
     
     def reset_today_impressions(self):
         """Reset today's record to 0 gained impressions (useful for first run correction)"""
@@ -371,23 +373,22 @@ class UpdateService:
             today = datetime.now().date()
             
             # Get total impressions from all tweets
-            all_tweets = self.supabase.table("ambassadors").select("Impressions").execute()
-            current_total = sum([tweet.get("Impressions", 0) for tweet in all_tweets.data]) if all_tweets.data else 0
+            current_total = self.get_total_impressions()
             
             # Update today's record to 0 gained
-            result = self.supabase.table("daily_impressions").update({
+            result = self._execute(self.supabase.table("daily_impressions").update({
                 "total_impressions": current_total,
                 "impressions_gained": 0
-            }).eq("date", today.isoformat()).execute()
+            }).eq("date", today.isoformat()))
             
             if result.data:
-                print(f"📊 Reset today's impressions to baseline: {current_total} total, 0 gained")
+                logger.info("📊 Reset today's impressions to baseline: %s total, 0 gained", current_total)
                 return True, f"Today reset to baseline: {current_total} total impressions"
             else:
                 return False, "No record found for today"
                 
         except Exception as e:
-            print(f"❌ Error resetting today's impressions: {e}")
+            logger.error("❌ Error resetting today's impressions: %s", e)
             return False, f"Error: {str(e)}"
     
     def auto_calculate_daily_impressions(self):
@@ -396,12 +397,12 @@ class UpdateService:
             today = datetime.now().date()
             
             # Check if today's record already exists
-            existing = self.supabase.table("daily_impressions").select("*").eq("date", today.isoformat()).execute()
+            existing = self._execute(self.supabase.table("daily_impressions").select("created_at").eq("date", today.isoformat()))
             
             if existing.data:
                 # Record exists - check if it needs updating (only update once per hour to avoid spam)
                 existing_record = existing.data[0]
-                created_at = datetime.fromisoformat(existing_record['created_at'].replace('Z', '+00:00'))
+                created_at = datetime.fromisoformat(existing_record['created_at'])
                 hours_since_creation = (datetime.now(created_at.tzinfo) - created_at).total_seconds() / 3600
                 
                 if hours_since_creation >= 1:  # Update if more than 1 hour old
@@ -413,71 +414,49 @@ class UpdateService:
                 return self.calculate_daily_impressions()
                 
         except Exception as e:
-            print(f"❌ Error in auto-calculation: {e}")
+            logger.error("❌ Error in auto-calculation: %s", e)
             return False, f"Auto-calculation error: {str(e)}"
     
     def get_total_leaderboard(self, year=None, month=None):
         """Get combined views leaderboard from both X and Reddit platforms - only counts posts with >500 impressions/views"""
         try:
-            # Get X data directly from database with 500+ impression filter
-            query = self.supabase.table("ambassadors").select("*").not_.is_("date_posted", "null").gt("Impressions", 500)
-            
-            # Filter by month/year if provided
-            if year and month:
-                # Get start and end of month
-                start_date = datetime(year, month, 1).date()
-                from calendar import monthrange
-                last_day = monthrange(year, month)[1]
-                end_date = datetime(year, month, last_day).date()
-                
-                query = query.gte("date_posted", start_date.isoformat()).lte("date_posted", end_date.isoformat())
-            
-            x_result = query.execute()
-            
-            # Get Reddit data directly from database (no filtering - include all Reddit posts)
-            reddit_query = self.supabase.table("reddit").select("*").not_.is_("Score", "null")
-            
-            # Filter by month/year if provided
-            if year and month:
-                reddit_query = reddit_query.gte("submitted_at", start_date.isoformat()).lte("submitted_at", end_date.isoformat())
-            
-            reddit_result = reddit_query.execute()
-            
-            # Combine views by ambassador name
-            combined_stats = {}
+            start_date, end_date = month_bounds(year, month)
+            
+            def x_query():
+                # Get X data directly from database with 500+ impression filter
+                query = self.supabase.table("ambassadors").select("Ambassador, Impressions").not_.is_("date_posted", "null").gt("Impressions", 500)
+                # Filter by month/year if provided
+                if start_date:
+                    query = query.gte("date_posted", start_date).lte("date_posted", end_date)
+                return query
+            
+            def reddit_query():
+                # Get Reddit data directly from database (no filtering - include all Reddit posts)
+                query = self.supabase.table("reddit").select("poster, Views").not_.is_("Score", "null")
+                # Filter by month/year if provided
+                if start_date:
+                    query = query.gte("submitted_at", start_date).lte("submitted_at", end_date)
+                return query
+            
+            x_rows = self._fetch_all(x_query)
+            reddit_rows = self._fetch_all(reddit_query)
+            
+            # Combine views by ambassador name - [x_views, reddit_views] accumulators
+            combined_views = defaultdict(lambda: [0, 0])
             
             # Process X data (impressions = views) - only posts with >500 impressions
-            if x_result.data:
-                for tweet in x_result.data:
-                    name = tweet["Ambassador"]
-                    if name not in combined_stats:
-                        combined_stats[name] = {
-                            "name": name,
-                            "x_views": 0,
-                            "reddit_views": 0,
-                            "total_views": 0
-                        }
-                    combined_stats[name]["x_views"] += tweet["Impressions"]
-                    combined_stats[name]["total_views"] += tweet["Impressions"]
+            for tweet in x_rows:
+                combined_views[tweet["Ambassador"]][0] += tweet["Impressions"]
             
             # Process Reddit data - include all Reddit posts (use actual Views field)
-            if reddit_result.data:
-                for post in reddit_result.data:
-                    name = post["poster"]
-                    views = post.get("Views", 0) if post.get("Views") else 0
-                    if name not in combined_stats:
-                        combined_stats[name] = {
-                            "name": name,
-                            "x_views": 0,
-                            "reddit_views": views,
-                            "total_views": views
-                        }
-                    else:
-                        combined_stats[name]["reddit_views"] += views
-                        combined_stats[name]["total_views"] += views
+            for post in reddit_rows:
+                combined_views[post["poster"]][1] += post.get("Views") or 0
             
             # Convert to list and sort by total views
-            total_leaderboard = list(combined_stats.values())
+            total_leaderboard = [
+                {"name": name, "x_views": x_views, "reddit_views": reddit_views, "total_views": x_views + reddit_views}
+                for name, (x_views, reddit_views) in combined_views.items()
+            ]
             
             # Separate Tony from other ambassadors
             tony_entry = None
@@ -499,7 +478,7 @@ class UpdateService:
             
             return final_leaderboard
         except Exception as e:
-            print(f"❌ Total leaderboard error: {e}")
+            logger.error("❌ Total leaderboard error: %s", e)
             return []
     
     def get_available_months(self):
@@ -508,9 +487,9 @@ class UpdateService:
             months_set = set()
             
             # Get months from X data
-            x_result = self.supabase.table("ambassadors").select("date_posted").not_.is_("date_posted", "null").execute()
-            if x_result.data:
-                for record in x_result.data:
+            x_rows = self._fetch_all(lambda: self.supabase.table("ambassadors").select("date_posted").not_.is_("date_posted", "null"))
+            if x_rows:
+                for record in x_rows:
                     if record["date_posted"]:
                         date_obj = datetime.fromisoformat(record["date_posted"]).date()
                         # Filter out June 2025 and any future dates
@@ -518,9 +497,9 @@ class UpdateService:
                             months_set.add((date_obj.year, date_obj.month))
             
             # Get months from Reddit data
-            reddit_result = self.supabase.table("reddit").select("submitted_at").not_.is_("Score", "null").execute()
-            if reddit_result.data:
-                for record in reddit_result.data:
+            reddit_rows = self._fetch_all(lambda: self.supabase.table("reddit").select("submitted_at").not_.is_("Score", "null"))
+            if reddit_rows:
+                for record in reddit_rows:
                     if record["submitted_at"]:
                         date_obj = datetime.fromisoformat(record["submitted_at"]).date()
                         # Filter out June 2025 and any future dates
@@ -535,7 +514,7 @@ class UpdateService:
             ], reverse=True)
             return available_months
         except Exception as e:
-            print(f"❌ Error getting available months: {e}")
+            logger.error("❌ Error getting available months: %s", e)
             return []
     
     def update_reddit_stats(self):
@@ -546,13 +525,10 @@ class UpdateService:
             
             # Get current month date range
             current_date = datetime.now()
-            start_date = datetime(current_date.year, current_date.month, 1).date()
-            from calendar import monthrange
-            last_day = monthrange(current_date.year, current_date.month)[1]
-            end_date = datetime(current_date.year, current_date.month, last_day).date()
+            start_date, end_date = month_bounds(current_date.year, current_date.month)
             
             # Get only current month's Reddit posts from database
-            reddit_posts = self.supabase.table("reddit").select("*").gte("submitted_at", start_date.isoformat()).lte("submitted_at", end_date.isoformat()).execute()
+            reddit_posts = self._execute(self.supabase.table("reddit").select("id, url, poster, Views").gte("submitted_at", start_date).lte("submitted_at", end_date))
             
             if not reddit_posts.data:
                 current_month_name = current_date.strftime("%B %Y")
@@ -565,7 +541,7 @@ class UpdateService:
                 try:
                     post_id = self.extract_reddit_id(post.get('url', ''))
                     if not post_id:
-                        print(f"⚠️ Could not extract post ID from URL: {post.get('url', 'No URL')}")
+                        logger.warning("⚠️ Could not extract post ID from URL: %s", post.get('url', 'No URL'))
                         failed_count += 1
                         continue
                     
@@ -586,18 +562,18 @@ class UpdateService:
                         'Views': existing_views  # Keep existing views as Reddit API doesn't provide this
                     }
                     
-                    self.supabase.table("reddit").update(update_data).eq("id", post["id"]).execute()
+                    self._execute(self.supabase.table("reddit").update(update_data).eq("id", post["id"]))
                     
-                    print(f"✅ Updated {post.get('poster', 'Unknown')}'s post: Score={score}, Comments={num_comments}")
+                    logger.debug("✅ Updated %s's post: Score=%s, Comments=%s", post.get('poster', 'Unknown'), score, num_comments)
                     updated_count += 1
                     
                 except Exception as post_error:
-                    print(f"❌ Failed to update post {post_id}: {str(post_error)}")
+                    logger.warning("❌ Failed to update post %s: %s", post_id, post_error)
                     failed_count += 1
                     continue
             
             current_month_name = current_date.strftime("%B %Y")
-            print(f"📊 Reddit API refresh complete for {current_month_name}: {updated_count} updated, {failed_count} failed")
+            logger.info("📊 Reddit API refresh complete for %s: %d updated, %d failed", current_month_name, updated_count, failed_count)
             
             if updated_count > 0:
                 return True, f"Updated {updated_count} {current_month_name} Reddit posts with fresh API data"
@@ -607,7 +583,7 @@ class UpdateService:
                 return True, f"No {current_month_name} posts needed updating"
             
         except Exception as e:
-            print(f"❌ Error updating Reddit stats: {e}")
+            logger.error("❌ Error updating Reddit stats: %s", e)
             return False, f"Reddit API error: {str(e)}"
     
     def remove_june_2025_data(self):
@@ -626,9 +602,9 @@ class UpdateService:
             daily_deleted = len(daily_result.data) if daily_result.data else 0
             
             total_deleted = x_deleted + reddit_deleted + daily_deleted
-            print(f"🗑️ Removed June 2025 data: {x_deleted} X posts, {reddit_deleted} Reddit posts, {daily_deleted} daily records")
+            logger.info("🗑️ Removed June 2025 data: %d X posts, %d Reddit posts, %d daily records", x_deleted, reddit_deleted, daily_deleted)
             
             return True, f"Removed {total_deleted} June 2025 records"
         except Exception as e:
-            print(f"❌ Error removing June 2025 data: {e}")
+            logger.error("❌ Error removing June 2025 data: %s", e)
             return False, f"Error: {str(e)}"
\ No newline at end of file